@@ -1,8 +1,10 @@
 import codecs
 import dataclasses as D
+from bisect import bisect_left
 from copy import copy
 from enum import Enum, StrEnum, auto
-from itertools import dropwhile
+from functools import cached_property
+from itertools import dropwhile, pairwise
 from textwrap import dedent
 from typing import (
     Annotated,
@@ -14,6 +16,7 @@ from typing import (
     Type,
     TypeVar,
 )
+from weakref import WeakValueDictionary
 
 import lsprotocol.types as L
 import tree_sitter as T
@@ -23,6 +26,8 @@ from joule.pretty import PrettyTree
 
 URI = Annotated[str, "URI"]
 
+NODE_AT_CACHE_SIZE = 64
+
 
 def strip_comments(nodes: list[T.Node]) -> list[T.Node]:
     return [node for node in nodes if not node.type == "comment"]
@@ -65,10 +70,17 @@ class LocationKey:
 
 @D.dataclass
 class AST:
+    # Slots are declared on the most numerous node types, together with their bases,
+    # to save the per-instance `__dict__`. Other node types still get one.
+    __slots__ = ("_sorted_children", "location", "parent")
+
     location: L.Location
 
     registry: ClassVar[dict[str, ParseCST]] = {}
 
+    # Variables are the only nodes written to, everything else is read.
+    highlight_kind: ClassVar[L.DocumentHighlightKind] = L.DocumentHighlightKind.Read
+
     @staticmethod
     def register(fn: ParseCST, *node_types: str):
         for node_type in node_types:
@@ -90,9 +102,12 @@ class AST:
     def __post_init__(self):
         self.parent: AST | None = None
 
-        for child in self.children:
+        children = list(self.children)
+        for child in children:
             child.parent = self
 
+        self._sorted_children = AST.sort_children(children)
+
     def to(self, expect_type: Type[ASTType]) -> ASTType:
         if not isinstance(self, expect_type):
             raise TypeError(
@@ -114,20 +129,52 @@ class AST:
         if isinstance(target, L.Position):
             target = L.Range(target, target)
 
-        candidate = head_or_none(
-            node
-            for child in self.children
-            if range_contains(child.location.range, target)
-            for node in maybe(child.node_at(target))
-        )
+        node = self
+        while (child := node.covering_child(target)) is not None:
+            node = child
 
-        match candidate:
-            case None if range_contains(self.location.range, target):
-                return self
-            case None:
+        if node is self and not range_contains(self.location.range, target):
+            return None
+        return node
+
+    def covering_child(self, target: L.Range) -> "AST | None":
+        """Returns the first child covering the target range."""
+        match self._sorted_children:
+            case (children, ends):
+                # Children are sorted by both start and end positions. All children
+                # before the first one ending at or after the target end cannot cover
+                # the target, and neither can any child after it if it does not.
+                i = bisect_left(ends, (target.end.line, target.end.character))
+                if (
+                    i < len(children)
+                    and children[i].location.range.start <= target.start
+                ):
+                    return children[i]
                 return None
-            case node:
-                return node
+            case _:
+                return head_or_none(
+                    child
+                    for child in self.children
+                    if range_contains(child.location.range, target)
+                )
+
+    @staticmethod
+    def sort_children(
+        children: list["AST"],
+    ) -> "tuple[list[AST], list[tuple[int, int]]] | None":
+        # Only worth bisecting among many children, and only possible when they
+        # appear in source order without nesting into each other.
+        if len(children) < 8:
+            return None
+
+        ranges = [child.location.range for child in children]
+        if any(
+            prev.start > next.start or prev.end > next.end
+            for prev, next in pairwise(ranges)
+        ):
+            return None
+
+        return children, [(r.end.line, r.end.character) for r in ranges]
 
 
 def skip_parenthesis(uri: URI, node: T.Node) -> "Expr":
@@ -221,6 +268,12 @@ class PrettyCST(PrettyTree):
 
 @D.dataclass
 class Expr(AST):
+    __slots__ = ("tail_of",)
+
+    # Whether the expression may contain nested binds, fields, or parameters. Leaf
+    # expressions like literals and variable references never do.
+    is_structural: ClassVar[bool] = True
+
     @staticmethod
     def from_cst(uri: URI, node: T.Node) -> "Expr":
         match AST.from_cst(uri, node):
@@ -279,6 +332,8 @@ class Expr(AST):
 
 @D.dataclass
 class Null(Expr):
+    is_structural: ClassVar[bool] = False
+
     @staticmethod
     def from_cst(uri: URI, node: T.Node) -> "Null":
         assert node.type == "null"
@@ -289,6 +344,13 @@ class Null(Expr):
 
 @D.dataclass
 class Dollar(Expr):
+    is_structural: ClassVar[bool] = False
+
+    def __post_init__(self):
+        super().__post_init__()
+        # Set during scope resolution.
+        self.outermost_object: Object | None = None
+
     @staticmethod
     def from_cst(uri: URI, node: T.Node) -> "Dollar":
         assert node.type == "dollar"
@@ -299,6 +361,13 @@ class Dollar(Expr):
 
 @D.dataclass
 class Self(Expr):
+    is_structural: ClassVar[bool] = False
+
+    def __post_init__(self):
+        super().__post_init__()
+        # Set during scope resolution.
+        self.enclosing_object: Object | None = None
+
     @staticmethod
     def from_cst(uri: URI, node: T.Node) -> "Self":
         assert node.type == "self"
@@ -309,6 +378,8 @@ class Self(Expr):
 
 @D.dataclass
 class Super(Expr):
+    is_structural: ClassVar[bool] = False
+
     @staticmethod
     def from_cst(uri: URI, node: T.Node) -> "Super":
         assert node.type == "super"
@@ -331,9 +402,41 @@ class Document(Expr):
         self.analysis_phase = AnalysisPhase.Unresolved
         self.top_level_scope: VarScope | None = None
         self.importees: list[Importee] = []
-        self.field_refs: list[Id.FieldRef] = []
+        # Field references in this document grouped by field name, in source order.
+        self.field_refs_by_name: dict[str, list[Id.FieldRef]] = {}
         self.calls: list[Call] = []
 
+        # Memoized `textDocument/documentHighlight` results, which only depend on this
+        # tree. Dropped along with the tree when the document changes.
+        self.highlight_cache: dict[PositionKey, tuple[L.DocumentHighlight, ...]] = {}
+
+        # Memoized `node_at` results for positions. Several requests are usually fired
+        # at the same cursor position, e.g. highlights, definitions, and references.
+        self.node_at_cache: dict[PositionKey, AST | None] = {}
+
+        # Memoized results of whole-document requests, set by their providers.
+        self.document_symbols: tuple[L.DocumentSymbol, ...] | None = None
+        self.inlay_hints: tuple[L.InlayHint, ...] | None = None
+        self.folding_ranges: tuple[L.FoldingRange, ...] | None = None
+
+    def node_at(self, target: L.Position | L.Range) -> AST | None:
+        if not isinstance(target, L.Position):
+            return super().node_at(target)
+
+        # Hits are re-inserted to keep the cache in LRU order.
+        cache = self.node_at_cache
+        key = PositionKey.of(target)
+
+        if key in cache:
+            node = cache.pop(key)
+        else:
+            node = super().node_at(target)
+            if len(cache) >= NODE_AT_CACHE_SIZE:
+                cache.pop(next(iter(cache)))
+
+        cache[key] = node
+        return node
+
     @property
     def children(self) -> Iterable[AST]:
         return [self.body]
@@ -356,11 +459,30 @@ class Id:
     class Var(Expr):
         name: str
 
+        highlight_kind: ClassVar[L.DocumentHighlightKind] = (
+            L.DocumentHighlightKind.Write
+        )
+
         def __post_init__(self):
             super().__post_init__()
             self.binding: VarBinding | None = None
             self.references: list[Id.VarRef] = []
 
+        @cached_property
+        def highlights(self) -> tuple[L.DocumentHighlight, ...]:
+            """Highlights of all references to this variable, followed by itself.
+
+            Only valid once scope resolution has collected all the references.
+            """
+            K = L.DocumentHighlightKind
+            return (
+                *(
+                    L.DocumentHighlight(r.location.range, K.Read)
+                    for r in self.references
+                ),
+                L.DocumentHighlight(self.location.range, K.Write),
+            )
+
         @staticmethod
         def from_cst(uri: URI, node: T.Node) -> "Id.Var":
             assert node.type == "id"
@@ -369,11 +491,17 @@ class Id:
 
     @D.dataclass
     class VarRef(Expr):
+        __slots__ = ("is_for_spec_ref", "name", "var")
+
         name: str
 
+        is_structural: ClassVar[bool] = False
+
         def __post_init__(self):
             super().__post_init__()
             self.var: Id.Var | None = None
+            # Set during scope resolution.
+            self.is_for_spec_ref = False
 
         @staticmethod
         def from_cst(uri: URI, node: T.Node) -> "Id.VarRef":
@@ -385,6 +513,8 @@ class Id:
 
     @D.dataclass
     class Field(Expr):
+        __slots__ = ("binding", "name")
+
         name: str
 
         def __post_init__(self):
@@ -399,6 +529,8 @@ class Id:
 
     @D.dataclass
     class FieldRef(Expr):
+        __slots__ = ("name",)
+
         name: str
 
         @staticmethod
@@ -411,6 +543,11 @@ class Id:
     class ParamRef(Expr):
         name: str
 
+        def __post_init__(self):
+            super().__post_init__()
+            # Set during scope resolution.
+            self.call: Call | None = None
+
         @staticmethod
         def from_cst(uri: URI, node: T.Node) -> "Id.ParamRef":
             assert node.type == "id"
@@ -422,6 +559,8 @@ class Id:
 class Num(Expr):
     value: float
 
+    is_structural: ClassVar[bool] = False
+
     @staticmethod
     def from_cst(uri: URI, node: T.Node) -> "Num":
         assert node.type == "number"
@@ -435,6 +574,8 @@ class Num(Expr):
 class Str(Expr):
     value: str
 
+    is_structural: ClassVar[bool] = False
+
     @staticmethod
     def from_cst(uri: URI, node: T.Node) -> "Str":
         assert node.type == "string"
@@ -468,6 +609,8 @@ class Str(Expr):
 class Bool(Expr):
     value: bool
 
+    is_structural: ClassVar[bool] = False
+
     @staticmethod
     def from_cst(uri: URI, node: T.Node) -> "Bool":
         assert node.type in ["true", "false"]
@@ -693,6 +836,13 @@ class Fn(Expr):
     params: list[Param]
     body: Expr
 
+    def __post_init__(self):
+        super().__post_init__()
+        # The first parameter wins if a name is (erroneously) declared twice.
+        self.params_by_name: dict[str, Param] = {
+            p.id.name: p for p in reversed(self.params)
+        }
+
     @property
     def children(self) -> Iterable[AST]:
         yield from self.params
@@ -850,6 +1000,11 @@ class ListComp(Expr):
     for_spec: ForSpec
     comp_spec: CompSpec
 
+    def __post_init__(self):
+        super().__post_init__()
+        # All specs in order, as visited by `Visitor.visit_comp_spec`.
+        self.specs: CompSpec = [self.for_spec, *self.comp_spec]
+
     @property
     def children(self) -> Iterable[AST]:
         yield self.expr
@@ -906,6 +1061,8 @@ class Import(Expr):
     type: ImportType
     importee: Importee
 
+    is_structural: ClassVar[bool] = False
+
     @property
     def children(self) -> Iterable[AST]:
         return [self.importee]
@@ -1042,6 +1199,8 @@ class Visibility(StrEnum):
 
 @D.dataclass
 class FieldKey(AST):
+    __slots__ = ()
+
     @staticmethod
     def from_cst(uri: URI, node: T.Node) -> "FieldKey":
         assert node.type == "fieldname"
@@ -1064,6 +1223,8 @@ class FieldKey(AST):
 
 @D.dataclass
 class FixedKey(FieldKey):
+    __slots__ = ("id",)
+
     id: Id.Field
 
     @property
@@ -1164,6 +1325,7 @@ class Object(Expr):
     def __post_init__(self):
         super().__post_init__()
         self.field_scope: FieldScope | None = None
+        self.has_fixed_keys = any(isinstance(f.key, FixedKey) for f in self.fields)
 
     @property
     def children(self) -> Iterable[AST]:
@@ -1214,6 +1376,8 @@ class ObjComp(Expr):
     def __post_init__(self):
         super().__post_init__()
         assert isinstance(self.field.key, ComputedKey)
+        # All specs in order, as visited by `Visitor.visit_comp_spec`.
+        self.specs: CompSpec = [self.for_spec, *self.comp_spec]
 
     @property
     def children(self) -> Iterable[AST]:
@@ -1291,6 +1455,8 @@ class ObjComp(Expr):
 
 @D.dataclass
 class FieldAccess(Expr):
+    __slots__ = ("field", "obj")
+
     obj: Expr
     field: Id.FieldRef
 
@@ -1477,15 +1643,24 @@ class VarScope:
     parent: "VarScope | None" = None
     children: list["VarScope"] = D.field(default_factory=list)
 
+    def __post_init__(self):
+        # Indexes bindings by name. Later bindings shadow earlier ones.
+        self.bindings_by_name: dict[str, VarBinding] = {
+            b.id.name: b for b in reversed(self.bindings)
+        }
+
     def bind(self, var: Id.Var, to: AST):
         var.binding = VarBinding(self, var, to)
         self.bindings.insert(0, var.binding)
+        self.bindings_by_name[var.name] = var.binding
 
     def get(self, name: str) -> VarBinding | None:
-        return next(
-            iter(b for b in self.bindings if b.id.name == name),
-            None if self.parent is None else self.parent.get(name),
-        )
+        scope = self
+        while scope is not None:
+            if (binding := scope.bindings_by_name.get(name)) is not None:
+                return binding
+            scope = scope.parent
+        return None
 
     def nest(self, owner: AST) -> "VarScope":
         child = VarScope(owner, [], parent=self)
@@ -1508,22 +1683,51 @@ class FieldBinding:
     target: Field
 
 
-@D.dataclass
+# Slotted, as field scopes are looked up in the innermost loops of definition requests.
+# The weakref slot is required by `FieldScope.merged`.
+@D.dataclass(slots=True, weakref_slot=True)
 class FieldScope:
-    owner: Object
+    owner: Object | None
     bindings: list[FieldBinding] = D.field(default_factory=list)
     parent: "FieldScope | None" = None
     children: list["FieldScope"] = D.field(default_factory=list)
 
+    # Own bindings indexed by field name. Later bindings shadow earlier ones, the same
+    # as the order of `bindings`.
+    bindings_by_name: dict[str, FieldBinding] = D.field(
+        init=False, repr=False, compare=False
+    )
+
+    # The (parent, child) pair this scope was merged from, if any. Also guards
+    # `merged` lookups against reused object IDs.
+    merged_from: "tuple[FieldScope, FieldScope] | None" = D.field(
+        default=None, init=False, repr=False, compare=False
+    )
+
+    # A shared, ownerless field scope for objects without any fixed keys.
+    EMPTY: ClassVar["FieldScope"]
+
+    # Scopes merged by `copy_with_child`, keyed by the identities of the merged scopes.
+    # Field scopes never change once resolved, so merged scopes are reused across
+    # requests for as long as anything still holds them.
+    merged: ClassVar["WeakValueDictionary[tuple[int, int], FieldScope]"]
+
+    def __post_init__(self):
+        self.bindings_by_name = {b.id.name: b for b in reversed(self.bindings)}
+
     def bind(self, key: FixedKey, to: Field):
+        assert self is not FieldScope.EMPTY, "Cannot bind to the shared empty scope."
         key.id.binding = FieldBinding(self, key.id, to)
         self.bindings.insert(0, key.id.binding)
+        self.bindings_by_name[key.id.name] = key.id.binding
 
     def get(self, name: str) -> FieldBinding | None:
-        return next(
-            iter(b for b in self.bindings if b.id.name == name),
-            None if self.parent is None else self.parent.get(name),
-        )
+        scope = self
+        while scope is not None:
+            if (binding := scope.bindings_by_name.get(name)) is not None:
+                return binding
+            scope = scope.parent
+        return None
 
     def nest(self, owner: Object) -> "FieldScope":
         child = FieldScope(owner, [], parent=self)
@@ -1531,6 +1735,12 @@ class FieldScope:
         return child
 
     def copy_with_child(self, child: "FieldScope") -> "FieldScope":
+        key = (id(self), id(child))
+        if (cached := FieldScope.merged.get(key)) is not None:
+            match cached.merged_from:
+                case (parent, other) if parent is self and other is child:
+                    return cached
+
         new_self = copy(self)
         new_self.children = copy(self.children)
         new_child = copy(child)
@@ -1538,6 +1748,9 @@ class FieldScope:
         new_self.children.append(new_child)
         new_child.parent = new_self
 
+        new_child.merged_from = (self, child)
+        FieldScope.merged[key] = new_child
+
         return new_child
 
     @property
@@ -1546,7 +1759,11 @@ class FieldScope:
 
     @staticmethod
     def empty(owner: Object) -> "FieldScope":
-        return FieldScope(owner)
+        return FieldScope(owner) if owner.has_fixed_keys else FieldScope.EMPTY
+
+
+FieldScope.EMPTY = FieldScope(None)
+FieldScope.merged = WeakValueDictionary()
 
 
 @D.dataclass
@@ -1599,14 +1816,12 @@ def enclosing_node(
     *,
     level: int | None = None,
 ) -> ASTType | None:
-    match node, level:
-        case None, _:
-            return None
-        case _, -1:
-            return None
-        case _ if isinstance(node, expected_type):
+    # Iterative rather than recursive: this walks up to the root on deep trees.
+    while node is not None and (level is None or level >= 0):
+        if isinstance(node, expected_type):
             return node
-        case _, None:
-            return enclosing_node(node.parent, expected_type, level=None)
-        case _, int():
-            return enclosing_node(node.parent, expected_type, level=level - 1)
+        node = node.parent
+        if level is not None:
+            level -= 1
+
+    return None
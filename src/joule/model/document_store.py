@@ -1,9 +1,12 @@
 import logging
 import os
 from functools import cached_property
+from hashlib import blake2b
 from pathlib import Path
 from typing import Callable, Iterable
 
+import lsprotocol.types as L
+
 import joule.ast as A
 from joule.ast import URI
 from joule.config import JouleConfig
@@ -14,6 +17,10 @@ from joule.parsing import parse_jsonnet
 log = logging.getLogger(__name__)
 
 
+def digest_of(source: bytes) -> bytes:
+    return blake2b(source, digest_size=16).digest()
+
+
 class DocumentStore:
     config: JouleConfig
     workspace_uri: URI
@@ -22,6 +29,23 @@ class DocumentStore:
     imports: dict[URI, set[URI]]
     imported_by: dict[URI, set[URI]]
 
+    # Digests of the sources the current trees were parsed from.
+    digests: dict[URI, bytes]
+
+    # Cached `textDocument/definition` results, keyed by tree identity and position.
+    # Any change to the store may affect definitions across documents via imports, so
+    # the whole cache is dropped whenever a document is added or deleted.
+    definition_cache: dict[
+        tuple[int, A.PositionKey], tuple[A.Document, list[L.Location]]
+    ]
+
+    # References to fields defined in a document, by document URI and field name, and
+    # grouped by the locations of the fields they resolve to. Indexed on demand by
+    # `ReferencesProvider`.
+    field_reference_index: dict[
+        tuple[URI, str], dict[A.LocationKey, list[A.Id.FieldRef]]
+    ]
+
     def __init__(self, config: JouleConfig, workspace_uri: URI) -> None:
         self.config = config
         self.workspace_uri = workspace_uri
@@ -29,6 +53,9 @@ class DocumentStore:
         self.trees = {}
         self.imports = {}
         self.imported_by = {}
+        self.digests = {}
+        self.definition_cache = {}
+        self.field_reference_index = {}
 
     @cached_property
     def workspace_path(self) -> Path:
@@ -88,14 +115,23 @@ class DocumentStore:
         for ast in self.trees.values():
             self.index_importees(ast)
 
+        self.clear_caches()
+
+    def clear_caches(self):
+        self.definition_cache.clear()
+        self.field_reference_index.clear()
+
     def index_importees(self, ast: A.Document):
         for importee in ast.importees:
             for uri in maybe(self.resolve_importee(importee)):
                 self.imports.setdefault(ast.location.uri, set()).add(uri)
                 self.imported_by.setdefault(uri, set()).add(ast.location.uri)
 
-    def scoped_ast_from_uri(self, uri: URI) -> A.Document:
-        cst = parse_jsonnet(Path.from_uri(uri).read_text())
+    def scoped_ast_from_uri(self, uri: URI, source: bytes | None = None) -> A.Document:
+        if source is None:
+            source = Path.from_uri(uri).read_bytes()
+        self.digests[uri] = digest_of(source)
+        cst = parse_jsonnet(source)
         ast = A.Document.from_cst(uri, cst)
         resolved = ScopeResolver().resolve(ast)
         return resolved
@@ -118,22 +154,24 @@ class DocumentStore:
     def recursive_importers(self, uri: URI) -> Iterable[URI]:
         """Distinct recursive importers of the document identified by `uri`."""
 
-        def recurse(uri: URI, importers: set[URI]):
-            for importer in self.imported_by.get(uri, set()):
+        importers: set[URI] = set()
+        pending = [uri]
+
+        while pending:
+            for importer in self.imported_by.get(pending.pop(), ()):
                 if importer not in importers:
                     importers.add(importer)
-                    recurse(importer, importers)
+                    pending.append(importer)
 
-        importers = set()
-        recurse(uri, importers)
         yield from importers
 
     def get(self, uri: URI) -> A.Document | None:
         return self.trees.get(uri)
 
-    def add(self, uri: URI):
-        ast = self.scoped_ast_from_uri(uri)
+    def add(self, uri: URI, source: bytes | None = None):
+        ast = self.scoped_ast_from_uri(uri, source)
         self.trees[uri] = ast
+        self.clear_caches()
 
         # TODO: This does not handle a correctness corner case.
         #
@@ -163,6 +201,8 @@ class DocumentStore:
 
     def delete(self, uri: URI):
         self.trees.pop(uri)
+        self.digests.pop(uri, None)
+        self.clear_caches()
 
         for importee in self.imports.pop(uri, set()):
             importers = self.imported_by.get(importee, set())
@@ -177,5 +217,12 @@ class DocumentStore:
                 self.imports.pop(importer)
 
     def update(self, uri: URI):
+        # Editors report every change to an open document, but documents are loaded
+        # from disk, which usually only changes on save. Unchanged sources keep their
+        # trees and all cached results.
+        source = Path.from_uri(uri).read_bytes()
+        if uri in self.trees and self.digests.get(uri) == digest_of(source):
+            return
+
         self.delete(uri)
-        self.add(uri)
+        self.add(uri, source)
@@ -3,16 +3,20 @@ from typing import Callable
 
 from joule import ast as A
 from joule.ast import AnalysisPhase, VarScope
-from joule.maybe import maybe
 from joule.visitor import Visitor
 
+SCOPED_EXPR_TYPES = (A.Local, A.Fn, A.Object, A.ListComp, A.ObjComp)
+
 
 class ScopeResolver(Visitor):
     """An AST visitor that creates scopes and bind variables and object fields."""
 
     def resolve(self, tree: A.Document) -> A.Document:
         self.tree = tree
+        self._field_refs_by_name = tree.field_refs_by_name
         self.var_scope: VarScope = VarScope(tree)
+        # Enclosing objects of the node being visited, outermost first.
+        self.objects: list[A.Object] = []
         self.visit(tree)
 
         tree.top_level_scope = self.var_scope
@@ -31,16 +35,30 @@ class ScopeResolver(Visitor):
 
     def visit_bind(self, b: A.Bind):
         self.var_scope.bind(b.id, b.value)
-        with self.activate_var_scope(self.var_scope.nest(owner=b)):
+
+        # A bind value never binds variables into the enclosing scope. Only values
+        # that create their own scopes get a nested scope owned by the bind.
+        if isinstance(b.value, SCOPED_EXPR_TYPES):
+            with self.activate_var_scope(self.var_scope.nest(owner=b)):
+                self.visit(b.value)
+        else:
             self.visit(b.value)
 
     def visit_call(self, e: A.Call):
         super().visit_call(e)
         self.tree.calls.append(e)
 
+        for a in e.args:
+            if a.id is not None:
+                a.id.call = e
+
+    def visit_dollar(self, e: A.Dollar):
+        if self.objects:
+            e.outermost_object = self.objects[0]
+
     def visit_field_access(self, e: A.FieldAccess):
         super().visit_field_access(e)
-        self.tree.field_refs.append(e.field)
+        self._field_refs_by_name.setdefault(e.field.name, []).append(e.field)
 
     def visit_fixed_key(self, e: A.Object, f: A.Field, k: A.FixedKey):
         assert e.field_scope is not None
@@ -57,9 +75,10 @@ class ScopeResolver(Visitor):
         # This requires parameters to be bound before traversing any parameter default
         # value expressions. This is also why parameters must be handled in `visit_fn`
         # instead of `visit_param`.
-        with self.activate_var_scope(self.var_scope.nest(owner=e)):
+        with self.activate_var_scope(self.var_scope.nest(owner=e)) as scope:
+            bind = scope.bind
             for p in e.params:
-                self.var_scope.bind(p.id, p)
+                bind(p.id, p)
 
             for p in e.params:
                 if p.default is not None:
@@ -96,15 +115,39 @@ class ScopeResolver(Visitor):
                     self.visit_assert(a)
                 self.visit(e.field.value)
 
-        self.visit_comp_spec([e.for_spec] + e.comp_spec, next)
+        self.visit_comp_spec(e.specs, next)
 
     def visit_object(self, e: A.Object):
+        self.objects.append(e)
+
         with self.activate_var_scope(self.var_scope.nest(owner=e)):
             e.field_scope = A.FieldScope.empty(e)
-            super().visit_object(e)
+
+            # Same traversal order as `Visitor.visit_object`, inlined.
+            for f in e.fields:
+                if isinstance(key := f.key, A.FixedKey):
+                    self.visit_fixed_key(e, f, key)
+                elif isinstance(key, A.ComputedKey):
+                    self.visit_computed_key(f, key)
+
+            for b in e.binds:
+                self.visit_bind(b)
+
+            for a in e.assertions:
+                self.visit_assert(a)
+
+            for f in e.fields:
+                self.visit(f.value)
+
+        self.objects.pop()
+
+    def visit_self(self, e: A.Self):
+        if self.objects:
+            e.enclosing_object = self.objects[-1]
 
     def visit_var_ref(self, e: A.Id.VarRef):
-        for binding in maybe(self.var_scope.get(e.name)):
+        if (binding := self.var_scope.get(e.name)) is not None:
             var = binding.id.to(A.Id.Var)
             e.var = var
+            e.is_for_spec_ref = isinstance(binding.target, A.ForSpec)
             var.references.append(e)
@@ -5,5 +5,8 @@ LANG_JSONNET = T.Language(J.language())
 JSONNET_TS_PARSER = T.Parser(LANG_JSONNET)
 
 
-def parse_jsonnet(source: str) -> T.Node:
-    return JSONNET_TS_PARSER.parse(source.encode()).root_node
+def parse_jsonnet(source: str | bytes) -> T.Node:
+    # Tree-sitter parses UTF-8 bytes. Raw file contents are passed through as is.
+    if isinstance(source, str):
+        source = source.encode()
+    return JSONNET_TS_PARSER.parse(source).root_node
@@ -1,13 +1,15 @@
 import inspect
 import logging
+from collections import ChainMap
 from itertools import chain
 from pathlib import Path
-from typing import Iterable
+from typing import Any, Callable, Iterable
 
 import lsprotocol.types as L
 
 from joule import ast as A
 from joule.ast import (
+    URI,
     AnalysisPhase,
     FieldBinding,
     FieldScope,
@@ -19,13 +21,17 @@ from joule.model import DocumentStore
 
 log = logging.getLogger(__name__)
 
+DEFINITION_CACHE_SIZE = 512
+
 
 def log_node(node: A.AST) -> bool:
-    caller = next(
-        caller
-        for frame in maybe(inspect.currentframe())
-        for caller in maybe(frame.f_back)
-    )
+    # Called on every resolution step. Skips frame inspection unless it is logged.
+    if not log.isEnabledFor(logging.DEBUG):
+        return True
+
+    frame = inspect.currentframe()
+    caller = None if frame is None else frame.f_back
+    assert caller is not None
 
     py_file_name = Path(inspect.getfile(caller)).name
     py_line = caller.f_lineno
@@ -46,60 +52,171 @@ def log_node(node: A.AST) -> bool:
 class DefinitionProvider:
     def __init__(self, store: DocumentStore) -> None:
         self.store = store
-        self.seen_callers: dict[A.LocationKey, list[A.Call]] = {}
+        self.seen_callers: ChainMap[A.LocationKey, list[A.Call]] = ChainMap()
+
+        # Per-request memos keyed by node identity. Chained field accesses like
+        # `a.b.c.d` otherwise re-resolve the field scopes of every prefix once per
+        # suffix. Trees are immutable once scope resolved, so this is safe within a
+        # single `serve()` call.
+        self.seen_field_scopes: ChainMap[tuple[int, str | None], list[FieldScope]] = (
+            ChainMap()
+        )
+        self.seen_field_bindings: ChainMap[int, list[FieldBinding]] = ChainMap()
+
+        # Number of caller searches in progress. Callers of a function being searched
+        # are incomplete until the search finishes, so results derived from them may
+        # be incomplete as well. Meanwhile, the memos above are written to a scratch
+        # layer, which is reused by the rest of the outermost search and dropped when
+        # it finishes.
+        self.caller_searches = 0
+
+        # Resolving an importee probes the file system once per search directory.
+        # Memoized per request, as the same module is often imported several times.
+        self.seen_importees: dict[A.ImporteeKey, URI | None] = {}
 
     def serve(self, tree: A.Document, pos: L.Position) -> list[L.Location]:
-        assert tree.analysis_phase == AnalysisPhase.ScopeResolved
+        return self.serve_many(tree, [pos])[0]
 
-        return [
-            location
-            for node in maybe(tree.node_at(pos))
-            for location in self.find_definition(node)
-        ]
+    def serve_many(
+        self, tree: A.Document, positions: list[L.Position]
+    ) -> list[list[L.Location]]:
+        """Batched `serve`, e.g. for adjacent positions requested together.
 
-    def find_definition(self, node: A.AST) -> Iterable[L.Location]:
-        log_node(node)
-        match node:
-            case A.Id.FieldRef() as ref:
-                return (b.id.location for b in self.find_field_binding(ref))
-            case A.Id.ParamRef() as ref:
-                return (b.id.location for b in self.find_param_binding(ref))
-            case A.Id.VarRef() as ref:
-                return (b.id.location for b in self.find_var_binding(ref))
-            case A.Importee():
-                return (
-                    doc.location
-                    for uri in maybe(self.store.resolve_importee(node))
-                    for doc in maybe(self.store.get(uri))
-                )
-            case _:
-                return ()
+        Uncached positions are located through the tree's node cache and resolved with
+        shared per-request memos.
+        """
+        assert tree.analysis_phase == AnalysisPhase.ScopeResolved
 
-    def find_var_binding(self, ref: A.Id.VarRef) -> Iterable[VarBinding]:
+        # Scope resolved trees are never mutated, so results can be reused until the
+        # store changes. Hits are re-inserted to keep the cache in LRU order.
+        cache = self.store.definition_cache
+        keys = [(id(tree), A.PositionKey.of(pos)) for pos in positions]
+        results: list[list[L.Location]] = [[] for _ in positions]
+        misses: list[int] = []
+
+        for i, key in enumerate(keys):
+            match cache.pop(key, None):
+                case (cached_tree, locations) if cached_tree is tree:
+                    cache[key] = (tree, locations)
+                    results[i] = list(locations)
+                case _:
+                    misses.append(i)
+
+        if not misses:
+            return results
+
+        try:
+            for i in misses:
+                node = tree.node_at(positions[i])
+                locations = [] if node is None else self.find_definition(node)
+
+                if len(cache) >= DEFINITION_CACHE_SIZE:
+                    cache.pop(next(iter(cache)))
+                cache[keys[i]] = (tree, locations)
+
+                results[i] = list(locations)
+        finally:
+            self.seen_field_scopes.clear()
+            self.seen_field_bindings.clear()
+            self.seen_importees.clear()
+
+        return results
+
+    def find_definition(self, node: A.AST) -> list[L.Location]:
+        log_node(node)
+        # Definitions are almost always unique, so eager lists are cheaper than
+        # generator chains here.
+        #
+        # Dispatches on the exact node type with a single dict probe. Class patterns in
+        # `match` statements pay an `isinstance` call per case tried.
+        handler = DEFINITION_FINDERS.get(type(node))
+        return [] if handler is None else handler(self, node)
+
+    def _definition_of_field_ref(self, ref: A.Id.FieldRef) -> list[L.Location]:
+        return [b.id.location for b in self.find_field_binding(ref)]
+
+    def _definition_of_param_ref(self, ref: A.Id.ParamRef) -> list[L.Location]:
+        return [b.id.location for b in self.find_param_binding(ref)]
+
+    def _definition_of_var_ref(self, ref: A.Id.VarRef) -> list[L.Location]:
+        # Scope resolution links each variable reference to the variable it binds to.
+        return [] if (var := ref.var) is None else [var.location]
+
+    def _definition_of_importee(self, importee: A.Importee) -> list[L.Location]:
+        doc = self.load_importee(importee)
+        return [] if doc is None else [doc.location]
+
+    def resolve_importee(self, importee: A.Importee) -> URI | None:
+        key = A.ImporteeKey.of(importee)
+        try:
+            return self.seen_importees[key]
+        except KeyError:
+            uri = self.seen_importees[key] = self.store.resolve_importee(importee)
+            return uri
+
+    def load_importee(self, importee: A.Importee) -> A.Document | None:
+        uri = self.resolve_importee(importee)
+        return None if uri is None else self.store.get(uri)
+
+    def find_var_binding(self, ref: A.Id.VarRef) -> list[VarBinding]:
         log_node(ref)
-        return (binding for var in maybe(ref.var) for binding in maybe(var.binding))
+        if (var := ref.var) is None or (binding := var.binding) is None:
+            return []
+        return [binding]
 
-    def find_param_binding(self, ref: A.Id.ParamRef) -> Iterable[VarBinding]:
+    def find_param_binding(self, ref: A.Id.ParamRef) -> list[VarBinding]:
         log_node(ref)
-        return (
-            binding
-            for call in maybe(enclosing_node(ref, A.Call, level=2))
-            for fn in self.find_fn(call.callee)
-            for param in fn.params
-            if param.id.name == ref.name
-            for binding in maybe(param.id.binding)
-        )
+        if (call := ref.call) is None:
+            return []
+
+        bindings = []
+        for fn in self.find_fn(call.callee):
+            param = fn.params_by_name.get(ref.name)
+            if param is not None and (binding := param.id.binding) is not None:
+                bindings.append(binding)
+
+        return bindings
 
     def find_field_binding(self, ref: A.Id.FieldRef) -> Iterable[FieldBinding]:
         log_node(ref)
+
+        key = id(ref)
+        if (bindings := self.seen_field_bindings.get(key)) is None:
+            bindings = self.seen_field_bindings[key] = list(
+                self._find_field_binding(ref)
+            )
+
+        return bindings
+
+    def _find_field_binding(self, ref: A.Id.FieldRef) -> Iterable[FieldBinding]:
+        if not isinstance(field_access := ref.parent, A.FieldAccess):
+            return ()
+
+        # Fast path for the most common shapes, `{...}.f` and `v.f` where `v` is bound
+        # to an object literal, bypassing the general field scope analysis.
+        obj = field_access.obj
+        if (
+            type(obj) is A.Id.VarRef
+            and (var := obj.var) is not None
+            and (var_binding := var.binding) is not None
+        ):
+            obj = var_binding.target
+        if type(obj) is A.Object:
+            scope = obj.field_scope
+            # Object literal field scopes have no parents, no need to go through
+            # `FieldScope.get`.
+            binding = None if scope is None else scope.bindings_by_name.get(ref.name)
+            return () if binding is None else (binding,)
+
         return (
             binding
-            for field_access in maybe(enclosing_node(ref, A.FieldAccess, level=1))
-            for scope in self.find_field_scope(field_access.obj)
-            for binding in maybe(scope.get(ref.name))
+            for scope in self.find_field_scope(field_access.obj, name=ref.name)
+            if (binding := scope.get(ref.name)) is not None
         )
 
-    def find_field_scope(self, node: A.AST) -> Iterable[FieldScope]:
+    def find_field_scope(
+        self, node: A.AST, *, name: str | None = None
+    ) -> Iterable[FieldScope]:
         """Given an AST node returning an object, finds the field scopes of the object.
 
         This is the major function that helps find the definition of an object field.
@@ -129,156 +246,194 @@ class DefinitionProvider:
 
             `val` at 3 tracks the two field scopes owned by objects at 1 and 2, each
             contributes a definition of field reference `f` at 4.
+
+        When `name` is given, the caller only looks up field `name` in the returned
+        scopes. Scopes that cannot resolve it may then be skipped, which saves
+        materializing the merged scopes of `+` expressions.
         """
         log_node(node)
 
-        match node:
-            case A.Array():
-                return (
-                    scope
-                    for value in node.values
-                    for scope in self.find_field_scope(value)
-                )
+        key = (id(node), name)
+        if (scopes := self.seen_field_scopes.get(key)) is None:
+            scopes = self.seen_field_scopes[key] = list(
+                self._find_field_scope(node, name)
+            )
 
-            case A.Binary() if node.op == A.Operator.Plus:
-                lhs_scopes = list(self.find_field_scope(node.lhs))
-                rhs_scopes = list(self.find_field_scope(node.rhs))
-
-                match lhs_scopes, rhs_scopes:
-                    case [], _:
-                        return rhs_scopes
-                    case _, []:
-                        return lhs_scopes
-                    case _:
-                        return (
-                            parent.copy_with_child(child)
-                            for parent in lhs_scopes
-                            for child in rhs_scopes
-                        )
-
-            case A.Call():
-                # Example:
-                #
-                #   local func() =
-                #       local v = 1;
-                #       { f: v };
-                #   func().f
-                #          ^1
-                #
-                # To find the definiton of field `f` at 2:
-                #
-                # - Finds the definition of `func`.
-                # - Finds tail expression of the body of `func`, which is `{ f: v }`.
-                # - Returns the field scope of `{ f: v }`, which contains the desired
-                #   defintion of field `f`.
-                return (
-                    scope
-                    for fn in self.find_fn(node.callee)
-                    for tail in fn.body.tails
-                    for scope in self.find_field_scope(tail)
-                )
+        return scopes
 
-            case A.Dollar():
+    def _find_field_scope(self, node: A.AST, name: str | None) -> Iterable[FieldScope]:
+        # Same dispatch scheme as `find_definition`. Expressions without a dedicated
+        # handler fall back to their tails.
+        if (handler := FIELD_SCOPE_FINDERS.get(type(node))) is not None:
+            return handler(self, node, name)
+        if isinstance(node, A.Expr):
+            return self._field_scope_of_tails(node, name)
+        return ()
 
-                def outermost_object(
-                    node: A.AST | None, so_far: A.Object | None = None
-                ) -> A.Object | None:
-                    match node:
-                        case None:
-                            return so_far
-                        case A.Object():
-                            return outermost_object(node.parent, node)
-                        case _:
-                            return outermost_object(node.parent, so_far)
+    def _field_scope_of_array(
+        self, node: A.Array, name: str | None
+    ) -> Iterable[FieldScope]:
+        return (
+            scope
+            for value in node.values
+            for scope in self.find_field_scope(value, name=name)
+        )
 
+    def _field_scope_of_binary(
+        self, node: A.Binary, name: str | None
+    ) -> Iterable[FieldScope]:
+        if node.op != A.Operator.Plus:
+            return self._field_scope_of_tails(node, name)
+
+        lhs_scopes = list(self.find_field_scope(node.lhs))
+        rhs_scopes = list(self.find_field_scope(node.rhs))
+
+        match lhs_scopes, rhs_scopes:
+            case [], _:
+                return rhs_scopes
+            case _, []:
+                return lhs_scopes
+            case _ if name is not None:
+                # A merged scope resolves `name` to the child's own binding if any,
+                # or otherwise to whatever the parent resolves. Returns whichever
+                # original scope does so instead of allocating the merged copy, and
+                # checks each side once rather than once per pair.
+                owners = [name in child.bindings_by_name for child in rhs_scopes]
+                resolvers = [parent.get(name) is not None for parent in lhs_scopes]
                 return (
-                    scope
-                    for obj in maybe(outermost_object(node))
-                    for scope in maybe(obj.field_scope)
+                    child if owns else parent
+                    for parent, resolves in zip(lhs_scopes, resolvers)
+                    for child, owns in zip(rhs_scopes, owners)
+                    if owns or resolves
                 )
-
-            case A.FieldAccess():
+            case _:
                 return (
-                    scope
-                    for binding in self.find_field_binding(node.field)
-                    if (field_value := binding.target.to(A.Field).value)
-                    for scope in self.find_field_scope(field_value)
+                    parent.copy_with_child(child)
+                    for parent in lhs_scopes
+                    for child in rhs_scopes
                 )
 
-            case A.ForSpec():
-                return self.find_field_scope(node.source)
+    def _field_scope_of_call(
+        self, node: A.Call, name: str | None
+    ) -> Iterable[FieldScope]:
+        # Example:
+        #
+        #   local func() =
+        #       local v = 1;
+        #       { f: v };
+        #   func().f
+        #          ^1
+        #
+        # To find the definiton of field `f` at 2:
+        #
+        # - Finds the definition of `func`.
+        # - Finds tail expression of the body of `func`, which is `{ f: v }`.
+        # - Returns the field scope of `{ f: v }`, which contains the desired
+        #   defintion of field `f`.
+        return (
+            scope
+            for fn in self.find_fn(node.callee)
+            for tail in fn.body.tails
+            for scope in self.find_field_scope(tail, name=name)
+        )
 
-            case A.Id.FieldRef():
-                return (
-                    scope
-                    for parent in maybe(node.parent)
-                    if (field_access := parent.to(A.FieldAccess))
-                    for scope in self.find_field_scope(field_access)
-                )
+    def _field_scope_of_dollar(
+        self, node: A.Dollar, name: str | None
+    ) -> Iterable[FieldScope]:
+        obj = node.outermost_object
+        return [] if obj is None or obj.field_scope is None else [obj.field_scope]
 
-            case A.Id.VarRef():
-                return (
-                    scope
-                    for binding in self.find_var_binding(node)
-                    for scope in self.find_field_scope(binding.target)
-                )
+    def _field_scope_of_field_access(
+        self, node: A.FieldAccess, name: str | None
+    ) -> Iterable[FieldScope]:
+        return (
+            scope
+            for binding in self.find_field_binding(node.field)
+            for scope in self.find_field_scope(binding.target.value, name=name)
+        )
 
-            case A.Import() if node.type == A.ImportType.Default:
-                return (
-                    scope
-                    for uri in maybe(self.store.resolve_importee(node.importee))
-                    for importee in maybe(self.store.get(uri))
-                    for scope in self.find_field_scope(importee)
-                )
+    def _field_scope_of_for_spec(
+        self, node: A.ForSpec, name: str | None
+    ) -> Iterable[FieldScope]:
+        return self.find_field_scope(node.source, name=name)
 
-            case A.Object():
-                return (scope for scope in maybe(node.field_scope))
+    def _field_scope_of_field_ref(
+        self, node: A.Id.FieldRef, name: str | None
+    ) -> Iterable[FieldScope]:
+        if not isinstance(field_access := node.parent, A.FieldAccess):
+            return ()
 
-            case A.Param():
-                call_args = (
-                    arg
-                    for fn in maybe(enclosing_node(node, A.Fn, level=1))
-                    for call in self.find_callers(fn)
-                    for arg in maybe(call.arg_of_param(node))
-                )
+        return self.find_field_scope(field_access, name=name)
 
-                return (
-                    scope
-                    for e in chain(maybe(node.default), call_args)
-                    for scope in self.find_field_scope(e)
-                )
+    def _field_scope_of_var_ref(
+        self, node: A.Id.VarRef, name: str | None
+    ) -> Iterable[FieldScope]:
+        return (
+            scope
+            for binding in self.find_var_binding(node)
+            for scope in self.find_field_scope(binding.target, name=name)
+        )
 
-            case A.Self():
-                return (
-                    scope
-                    for obj in maybe(enclosing_node(node, A.Object))
-                    for scope in maybe(obj.field_scope)
-                )
+    def _field_scope_of_import(
+        self, node: A.Import, name: str | None
+    ) -> Iterable[FieldScope]:
+        if node.type != A.ImportType.Default:
+            return self._field_scope_of_tails(node, name)
+
+        importee = self.load_importee(node.importee)
+        return [] if importee is None else self.find_field_scope(importee, name=name)
+
+    def _field_scope_of_object(
+        self, node: A.Object, name: str | None
+    ) -> Iterable[FieldScope]:
+        return [] if node.field_scope is None else [node.field_scope]
+
+    def _field_scope_of_param(
+        self, node: A.Param, name: str | None
+    ) -> Iterable[FieldScope]:
+        call_args = (
+            arg
+            for fn in maybe(enclosing_node(node, A.Fn, level=1))
+            for call in self.find_callers(fn)
+            for arg in maybe(call.arg_of_param(node))
+        )
 
-            case A.Expr():
-                return (
-                    scope
-                    for tail in node.tails
-                    if tail is not node
-                    for scope in self.find_field_scope(tail)
-                )
+        return (
+            scope
+            for e in chain(maybe(node.default), call_args)
+            for scope in self.find_field_scope(e, name=name)
+        )
 
-            case _:
-                return ()
+    def _field_scope_of_self(
+        self, node: A.Self, name: str | None
+    ) -> Iterable[FieldScope]:
+        obj = node.enclosing_object
+        return [] if obj is None or obj.field_scope is None else [obj.field_scope]
+
+    def _field_scope_of_tails(
+        self, node: A.Expr, name: str | None
+    ) -> Iterable[FieldScope]:
+        return (
+            scope
+            for tail in node.tails
+            if tail is not node
+            for scope in self.find_field_scope(tail, name=name)
+        )
 
     def find_callers(self, fn: A.Fn) -> Iterable[A.Call]:
         log_node(fn)
 
         def find(fn: A.Fn) -> Iterable[A.Call]:
             log_node(fn)
+            # Every node carries the URI of its document, no need to walk up to the
+            # enclosing `Document` node.
             return (
                 call
-                for doc in maybe(enclosing_node(fn, A.Document))
                 for uri in chain(
-                    self.store.recursive_importers(doc.location.uri),
-                    [doc.location.uri],
+                    self.store.recursive_importers(fn.location.uri),
+                    [fn.location.uri],
                 )
-                for tree in maybe(self.store.get(uri))
+                if (tree := self.store.get(uri)) is not None
                 for call in tree.calls
                 for callee in self.find_fn(call.callee)
                 if callee == fn
@@ -286,57 +441,115 @@ class DefinitionProvider:
 
         key = A.LocationKey.of(fn.location)
 
-        if key not in self.seen_callers:
-            self.seen_callers.setdefault(key, []).extend(find(fn))
-
-        return self.seen_callers[key]
-
-    def find_fn(self, node: A.AST) -> Iterable[A.Fn]:
+        if (callers := self.seen_callers.get(key)) is None:
+            # Registered before searching, so that recursive searches for callers of
+            # the same function terminate.
+            callers = self.seen_callers[key] = []
+
+            self.begin_caller_search()
+            try:
+                callers.extend(find(fn))
+            finally:
+                self.end_caller_search()
+
+        return callers
+
+    def begin_caller_search(self) -> None:
+        if self.caller_searches == 0:
+            self.seen_callers = self.seen_callers.new_child()
+            self.seen_field_scopes = self.seen_field_scopes.new_child()
+            self.seen_field_bindings = self.seen_field_bindings.new_child()
+        self.caller_searches += 1
+
+    def end_caller_search(self) -> None:
+        self.caller_searches -= 1
+        if self.caller_searches == 0:
+            # Nested results may have seen the incomplete callers of an enclosing
+            # search, and are not kept beyond it.
+            self.seen_callers = self.seen_callers.parents
+            self.seen_field_scopes = self.seen_field_scopes.parents
+            self.seen_field_bindings = self.seen_field_bindings.parents
+
+    def find_fn(self, node: A.AST) -> list[A.Fn]:
         """Given a function returning AST node, finds the definition of the function."""
         log_node(node)
 
-        match node:
-            case A.Call():
-                return (
-                    fn
-                    for callee in self.find_fn(node.callee)
-                    for tail in callee.body.tails
-                    for fn in self.find_fn(tail)
-                )
-
-            case A.Field() if isinstance(fn := node.value, A.Fn):
-                return maybe(fn)
-
-            case A.FieldAccess():
-                return self.find_fn(node.field)
-
-            case A.Fn():
-                return maybe(node)
-
-            case A.Id.FieldRef():
-                return (
-                    fn
-                    for binding in self.find_field_binding(node)
-                    for fn in self.find_fn(binding.target)
-                )
-
-            case A.Id.VarRef():
-                return (
-                    fn
-                    for binding in self.find_var_binding(node)
-                    for fn in self.find_fn(binding.target)
-                )
-
-            case A.Import() if node.type == A.ImportType.Default:
-                return (
-                    fn
-                    for uri in maybe(self.store.resolve_importee(node.importee))
-                    for importee in maybe(self.store.get(uri))
-                    for fn in self.find_fn(importee)
-                )
-
-            case A.Expr() if list(node.tails) != [node]:
-                return (fn for tail in node.tails for fn in self.find_fn(tail))
-
-            case _:
-                return ()
+        # Walks an explicit worklist instead of recursing, so that cyclic references
+        # in ill-formed code (e.g. `local f = f; f()`) terminate and shared subtrees
+        # are only visited once. Successors are pushed in reverse to keep the
+        # depth-first order of a recursive walk.
+        fns: list[A.Fn] = []
+        pending: list[A.AST] = [node]
+        seen: set[int] = set()
+
+        while pending:
+            node = pending.pop()
+            if id(node) in seen:
+                continue
+            seen.add(id(node))
+
+            match node:
+                case A.Call():
+                    successors = [
+                        tail
+                        for callee in self.find_fn(node.callee)
+                        for tail in callee.body.tails
+                    ]
+
+                case A.Field() if isinstance(fn := node.value, A.Fn):
+                    fns.append(fn)
+                    continue
+
+                case A.FieldAccess():
+                    successors = [node.field]
+
+                case A.Fn():
+                    fns.append(node)
+                    continue
+
+                case A.Id.FieldRef():
+                    successors = [b.target for b in self.find_field_binding(node)]
+
+                case A.Id.VarRef():
+                    successors = [b.target for b in self.find_var_binding(node)]
+
+                case A.Import() if node.type == A.ImportType.Default:
+                    importee = self.load_importee(node.importee)
+                    successors = [] if importee is None else [importee]
+
+                case A.Expr() if (tails := list(node.tails)) != [node]:
+                    successors = tails
+
+                case _:
+                    continue
+
+            pending.extend(reversed(successors))
+
+        return fns
+
+
+DEFINITION_FINDERS: dict[
+    type, Callable[[DefinitionProvider, Any], list[L.Location]]
+] = {
+    A.Id.FieldRef: DefinitionProvider._definition_of_field_ref,
+    A.Id.ParamRef: DefinitionProvider._definition_of_param_ref,
+    A.Id.VarRef: DefinitionProvider._definition_of_var_ref,
+    A.Importee: DefinitionProvider._definition_of_importee,
+}
+
+FIELD_SCOPE_FINDERS: dict[
+    type, Callable[[DefinitionProvider, Any], Iterable[FieldScope]]
+] = {
+    A.Array: DefinitionProvider._field_scope_of_array,
+    A.Binary: DefinitionProvider._field_scope_of_binary,
+    A.Call: DefinitionProvider._field_scope_of_call,
+    A.Dollar: DefinitionProvider._field_scope_of_dollar,
+    A.FieldAccess: DefinitionProvider._field_scope_of_field_access,
+    A.ForSpec: DefinitionProvider._field_scope_of_for_spec,
+    A.Id.FieldRef: DefinitionProvider._field_scope_of_field_ref,
+    A.Id.VarRef: DefinitionProvider._field_scope_of_var_ref,
+    A.Import: DefinitionProvider._field_scope_of_import,
+    A.Object: DefinitionProvider._field_scope_of_object,
+    A.Param: DefinitionProvider._field_scope_of_param,
+    A.Self: DefinitionProvider._field_scope_of_self,
+}
@@ -5,14 +5,30 @@ import lsprotocol.types as L
 from joule import ast as A
 from joule.ast import AnalysisPhase
 
+HIGHLIGHT_CACHE_SIZE = 128
+
 
 class DocumentHighlightProvider:
     def serve(self, tree: A.Document, pos: L.Position) -> list[L.DocumentHighlight]:
         assert tree.analysis_phase == AnalysisPhase.ScopeResolved
-        from lsprotocol.types import DocumentHighlightKind as K
 
-        def to_highlight() -> Iterable[A.AST]:
-            match node := tree.node_at(pos):
+        # Hits are re-inserted to keep the cache in LRU order.
+        cache = tree.highlight_cache
+        key = A.PositionKey.of(pos)
+
+        if (highlights := cache.pop(key, None)) is None:
+            highlights = tuple(self.find_highlights(tree, pos))
+            if len(cache) >= HIGHLIGHT_CACHE_SIZE:
+                cache.pop(next(iter(cache)))
+
+        cache[key] = highlights
+        return list(highlights)
+
+    def find_highlights(
+        self, tree: A.Document, pos: L.Position
+    ) -> Iterable[L.DocumentHighlight]:
+        def to_highlight(node: A.AST | None) -> Iterable[A.AST]:
+            match node:
                 case A.Field() if isinstance(node.value, A.Fn):
                     yield from node.value.body.tails
 
@@ -22,22 +38,23 @@ class DocumentHighlightProvider:
                 case A.Fn():
                     yield from node.body.tails
 
-                case A.Id.Var():
-                    yield from node.references
-                    yield node
-
-                case A.Id.VarRef() if node.var is not None:
-                    yield node.var
-                    yield from node.var.references
-
                 case A.If() | A.Local():
                     yield from node.tails
 
                 case _:
                     pass
 
+        # Variable highlights are precomputed on the variable. For references, the
+        # variable itself goes first.
+        match node := tree.node_at(pos):
+            case A.Id.Var():
+                return node.highlights
+
+            case A.Id.VarRef() if node.var is not None:
+                *references, var = node.var.highlights
+                return (var, *references)
+
         return [
-            L.DocumentHighlight(id.location.range, kind)
-            for id in to_highlight()
-            if (kind := K.Write if isinstance(id, A.Id.Var) else K.Read,)
+            L.DocumentHighlight(id.location.range, id.highlight_kind)
+            for id in to_highlight(node)
         ]
@@ -1,40 +1,39 @@
-from contextlib import contextmanager
 from typing import Callable, Sequence
 
 import lsprotocol.types as L
 
 from joule import ast as A
-from joule.maybe import maybe
 from joule.visitor import Visitor
 
+ZERO_RANGE = L.Range(L.Position(0, 0), L.Position(0, 0))
+
 
 class DocumentSymbolProvider(Visitor):
     def __init__(self) -> None:
         self.root_symbol = L.DocumentSymbol(
             name="__root__",
             kind=L.SymbolKind.Module,
-            range=L.Range(L.Position(0, 0), L.Position(0, 0)),
-            selection_range=L.Range(L.Position(0, 0), L.Position(0, 0)),
+            range=ZERO_RANGE,
+            selection_range=ZERO_RANGE,
+            children=[],
         )
+        # Symbols enclosing the node being visited. An exception aborts the whole
+        # request, so pushes and pops are not guarded by `try`/`finally`.
         self.breadcrumb = [self.root_symbol]
 
     def serve(self, tree: A.Document) -> Sequence[L.DocumentSymbol]:
-        self.visit(tree)
-        return self.root_symbol.children or []
+        if tree.document_symbols is None:
+            self.visit(tree)
+            tree.document_symbols = tuple(self.root_symbol.children or [])
+        return list(tree.document_symbols)
 
     def add_symbol(self, symbol: L.DocumentSymbol):
+        # Leaf symbols keep `children` as `None` so that it is omitted from responses.
         parent = self.breadcrumb[-1]
-        children = [child for children in maybe(parent.children) for child in children]
-        children.append(symbol)
-        parent.children = children
-
-    @contextmanager
-    def open_symbol(self, symbol: L.DocumentSymbol):
-        self.breadcrumb.append(symbol)
-        try:
-            yield symbol
-        finally:
-            self.breadcrumb.pop()
+        if parent.children is None:
+            parent.children = [symbol]
+        else:
+            parent.children.append(symbol)
 
     def visit_bind(self, b: A.Bind):
         symbol = L.DocumentSymbol(
@@ -45,8 +44,9 @@ class DocumentSymbolProvider(Visitor):
         )
 
         self.add_symbol(symbol)
-        with self.open_symbol(symbol):
-            self.visit(b.value)
+        self.breadcrumb.append(symbol)
+        self.visit(b.value)
+        self.breadcrumb.pop()
 
     def visit_param(self, p: A.Param):
         symbol = L.DocumentSymbol(
@@ -59,8 +59,9 @@ class DocumentSymbolProvider(Visitor):
         self.add_symbol(symbol)
 
         if p.default is not None:
-            with self.open_symbol(symbol):
-                self.visit(p.default)
+            self.breadcrumb.append(symbol)
+            self.visit(p.default)
+            self.breadcrumb.pop()
 
     def visit_object(self, e: A.Object):
         for f in e.fields:
@@ -74,8 +75,10 @@ class DocumentSymbolProvider(Visitor):
                     )
 
                     self.add_symbol(symbol)
-                    with self.open_symbol(symbol):
+                    if f.value.is_structural:
+                        self.breadcrumb.append(symbol)
                         self.visit_field_value(f)
+                        self.breadcrumb.pop()
 
                 case A.ComputedKey() as k:
                     self.visit_computed_key(f, k)
@@ -9,8 +9,17 @@ class FoldingRangeProvider(Visitor):
         self.folding_ranges: list[L.FoldingRange] = []
 
     def serve(self, tree: A.Document) -> list[L.FoldingRange]:
-        self.visit(tree)
-        return self.folding_ranges
+        if tree.folding_ranges is None:
+            self.visit(tree)
+            tree.folding_ranges = tuple(self.folding_ranges)
+        return list(tree.folding_ranges)
+
+    def visit(self, tree: A.AST):
+        # Nothing inside a single-line node can span multiple lines, so the whole
+        # subtree is skipped.
+        span = tree.location.range
+        if span.start.line != span.end.line:
+            super().visit(tree)
 
     def _add_folding_range(self, span: L.Range):
         if span.start.line != span.end.line:
@@ -5,7 +5,6 @@ import lsprotocol.types as L
 
 from joule import ast as A
 from joule.ast import AnalysisPhase
-from joule.maybe import maybe
 from joule.visitor import Visitor
 
 
@@ -14,59 +13,60 @@ class Icon(StrEnum):
     DownArrow = ""
 
 
+# Label parts shared by all hints. Only reference counts above `len(COUNT_PARTS) - 1`
+# allocate fresh label parts.
+UP_ARROW_PART = L.InlayHintLabelPart(Icon.UpArrow)
+DOWN_ARROW_PART = L.InlayHintLabelPart(Icon.DownArrow)
+COUNT_PARTS = tuple(L.InlayHintLabelPart(str(n)) for n in range(33))
+
+
+def count_part(n: int) -> L.InlayHintLabelPart:
+    return COUNT_PARTS[n] if n < len(COUNT_PARTS) else L.InlayHintLabelPart(str(n))
+
+
 class InlayHintProvider(Visitor):
     def __init__(self) -> None:
         self.hints: list[L.InlayHint] = []
 
     def serve(self, tree: A.Document) -> list[L.InlayHint]:
         assert tree.analysis_phase == AnalysisPhase.ScopeResolved
-        self.visit(tree)
-        return self.hints
+        if tree.inlay_hints is None:
+            self.visit(tree)
+            tree.inlay_hints = tuple(self.hints)
+        return list(tree.inlay_hints)
 
     def visit_var_ref(self, e: A.Id.VarRef):
         super().visit_var_ref(e)
 
-        for_spec_var_ref = next(
-            (
-                isinstance(binding.target, A.ForSpec)
-                for var in maybe(e.var)
-                for binding in maybe(var.binding)
-            ),
-            False,
-        )
-
         if e.var is not None:
             self._add_hint(
                 e.location.range.start,
                 # Marks for-spec variable references with an down-arrow as for-spec
                 # variables are defined after their references.
-                Icon.DownArrow if for_spec_var_ref else Icon.UpArrow,
+                Icon.DownArrow if e.is_for_spec_ref else Icon.UpArrow,
             )
 
     def visit_bind(self, b: A.Bind):
         super().visit_bind(b)
         n_refs = len(b.id.references)
-        self._add_hint(b.id.location.range.start, [Icon.DownArrow, str(n_refs)])
+        self._add_hint(b.id.location.range.start, [DOWN_ARROW_PART, count_part(n_refs)])
 
     def visit_param(self, p: A.Param):
         super().visit_param(p)
         n_refs = len(p.id.references)
-        self._add_hint(p.id.location.range.start, [Icon.DownArrow, str(n_refs)])
+        self._add_hint(p.id.location.range.start, [DOWN_ARROW_PART, count_part(n_refs)])
 
     def visit_for_spec(self, s: A.ForSpec, next: Callable[[], None]):
         def new_next():
             n_refs = len(s.id.references)
             # Marks for-spec variables with an up-arrow as for-spec variables
             # are defined after their references.
-            self._add_hint(s.id.location.range.start, [Icon.UpArrow, str(n_refs)])
+            self._add_hint(
+                s.id.location.range.start, [UP_ARROW_PART, count_part(n_refs)]
+            )
             next()
 
         super().visit_for_spec(s, new_next)
 
-    def _add_hint(self, pos: L.Position, label_parts: str | list[str]):
-        label = (
-            [L.InlayHintLabelPart(part) for part in label_parts]
-            if isinstance(label_parts, list)
-            else label_parts
-        )
+    def _add_hint(self, pos: L.Position, label: str | list[L.InlayHintLabelPart]):
         self.hints.append(L.InlayHint(pos, label))
@@ -1,11 +1,9 @@
-from itertools import chain
 from typing import Iterable
 
 import lsprotocol.types as L
 
 from joule import ast as A
-from joule.ast import AnalysisPhase
-from joule.maybe import maybe
+from joule.ast import URI, AnalysisPhase
 from joule.model import DocumentStore
 from joule.providers import DefinitionProvider
 
@@ -16,11 +14,11 @@ class ReferencesProvider:
 
     def serve(self, tree: A.Document, pos: L.Position) -> list[L.Location] | None:
         assert tree.analysis_phase == AnalysisPhase.ScopeResolved
-        refs = [
-            ref.location
-            for node in maybe(tree.node_at(pos))
-            for ref in self.find_references(node)
-        ]
+        node = tree.node_at(pos)
+        if node is None:
+            return None
+
+        refs = [ref.location for ref in self.find_references(node)]
         return refs if len(refs) > 0 else None
 
     def find_references(self, node: A.AST) -> Iterable[A.Expr]:
@@ -33,16 +31,44 @@ class ReferencesProvider:
                 return ()
 
     def find_field_references(self, field: A.Id.Field) -> Iterable[A.Id.FieldRef]:
-        return (
-            ref
-            for uri in chain(
-                self.store.recursive_importers(field.location.uri),
-                [field.location.uri],
-            )
-            for tree in maybe(self.store.get(uri))
-            for ref in tree.field_refs
-            if ref.name == field.name
-            for binding in DefinitionProvider(self.store).find_field_binding(ref)
-            if isinstance(fixed_key := binding.target.key, A.FixedKey)
-            if fixed_key.id == field
-        )
+        key = (field.location.uri, field.name)
+        index = self.store.field_reference_index
+        if (refs_by_field := index.get(key)) is None:
+            refs_by_field = index[key] = self.index_field_references(*key)
+        return refs_by_field.get(A.LocationKey.of(field.location), [])
+
+    def index_field_references(
+        self, uri: URI, name: str
+    ) -> dict[A.LocationKey, list[A.Id.FieldRef]]:
+        """Resolves all references to fields named `name` defined in document `uri`.
+
+        Only `uri` and its recursive importers can refer to its fields. References are
+        grouped by the locations of the fields they resolve to, so that later searches
+        for other fields of the same name in the same document are plain lookups.
+        """
+        # A single provider for the whole index, so that field scopes and importees
+        # memoized while resolving one reference are reused by the rest.
+        definitions = DefinitionProvider(self.store)
+        refs_by_field: dict[A.LocationKey, list[A.Id.FieldRef]] = {}
+
+        # With cyclic imports, the document defining the field is also one of its own
+        # recursive importers. Each document is searched only once.
+        uris = list(self.store.recursive_importers(uri))
+        if uri not in uris:
+            uris.append(uri)
+
+        for importer in uris:
+            if (tree := self.store.get(importer)) is None:
+                continue
+
+            for ref in tree.field_refs_by_name.get(name, ()):
+                for binding in definitions.find_field_binding(ref):
+                    fixed_key = binding.target.key
+                    if (
+                        isinstance(fixed_key, A.FixedKey)
+                        and fixed_key.id.location.uri == uri
+                    ):
+                        key = A.LocationKey.of(fixed_key.id.location)
+                        refs_by_field.setdefault(key, []).append(ref)
+
+        return refs_by_field
@@ -1,8 +1,9 @@
+from itertools import chain
+
 import lsprotocol.types as L
 
 from joule import ast as A
 from joule.ast import AnalysisPhase
-from joule.maybe import head_or_none, maybe
 
 
 class RenameProvider:
@@ -10,11 +11,12 @@ class RenameProvider:
         self, tree: A.Document, pos: L.Position
     ) -> L.PrepareRenamePlaceholder | None:
         assert tree.analysis_phase == AnalysisPhase.ScopeResolved
-        return head_or_none(
-            L.PrepareRenamePlaceholder(range=node.location.range, placeholder=node.name)
-            for node in maybe(tree.node_at(pos))
-            if isinstance(node, A.Id.Var) or isinstance(node, A.Id.VarRef)
-        )
+        node = tree.node_at(pos)
+        if isinstance(node, A.Id.Var) or isinstance(node, A.Id.VarRef):
+            return L.PrepareRenamePlaceholder(
+                range=node.location.range, placeholder=node.name
+            )
+        return None
 
     def serve(
         self,
@@ -26,13 +28,12 @@ class RenameProvider:
             case A.Id.Var() as var:
                 text_edits = [
                     L.TextEdit(range=node.location.range, new_text=new_name)
-                    for node in var.references + [var]
+                    for node in chain(var.references, [var])
                 ]
-            case A.Id.VarRef() as ref:
+            case A.Id.VarRef(var=A.Id.Var() as var):
                 text_edits = [
                     L.TextEdit(range=node.location.range, new_text=new_name)
-                    for var in maybe(ref.var)
-                    for node in var.references + [var]
+                    for node in chain(var.references, [var])
                 ]
             case _:
                 text_edits = []
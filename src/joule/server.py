@@ -1,10 +1,12 @@
 import asyncio
+import logging
 import uuid
 from enum import IntEnum, auto
 from functools import partial
 from pathlib import Path
 
 import lsprotocol.types as L
+from pygls.exceptions import FeatureNotificationError
 from pygls.lsp.server import LanguageServer
 
 from joule.ast import URI
@@ -21,6 +23,11 @@ from joule.providers import (
     RenameProvider,
 )
 
+log = logging.getLogger(__name__)
+
+# Seconds to wait for more edits before re-loading a changed document.
+UPDATE_DELAY = 0.15
+
 
 class JouleLanguageServer(LanguageServer):
     class State(IntEnum):
@@ -92,6 +99,10 @@ class JouleLanguageServer(LanguageServer):
 
     _document_store: DocumentStore | None = None
 
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self.pending_updates: dict[URI, asyncio.TimerHandle] = {}
+
     @property
     def store(self) -> DocumentStore:
         assert self.state == self.State.Initialized
@@ -162,6 +173,35 @@ class JouleLanguageServer(LanguageServer):
 
         await self.client_register_capability_async(L.RegistrationParams(registrations))
 
+    def schedule_update(self, uri: URI):
+        """Updates a changed document once edits to it pause for `UPDATE_DELAY`."""
+        if (handle := self.pending_updates.pop(uri, None)) is not None:
+            handle.cancel()
+
+        self.pending_updates[uri] = asyncio.get_running_loop().call_later(
+            UPDATE_DELAY, self.apply_update, uri
+        )
+
+    def apply_update(self, uri: URI):
+        self.pending_updates.pop(uri, None)
+
+        # Delayed updates run outside of any handler. Errors are logged and reported
+        # here, as pygls does for errors raised by notification handlers.
+        try:
+            self.store.update(uri)
+        except Exception as error:
+            log.exception("Failed to update document %s", uri)
+            self._report_server_error(error, FeatureNotificationError)
+
+    def flush_updates(self):
+        """Applies all pending updates, so that requests never see stale documents.
+
+        Requests may touch any document through imports, so all of them are flushed.
+        """
+        for uri, handle in list(self.pending_updates.items()):
+            handle.cancel()
+            self.apply_update(uri)
+
 
 server = JouleLanguageServer("joule", "v0.1")
 
@@ -187,7 +227,7 @@ async def initialized(ls: JouleLanguageServer, _: L.InitializedParams):
 async def did_change(ls: JouleLanguageServer, params: L.DidChangeTextDocumentParams):
     await ls.ready
     doc = ls.workspace.get_text_document(params.text_document.uri)
-    ls.store.update(doc.uri)
+    ls.schedule_update(doc.uri)
 
 
 @server.feature(L.WORKSPACE_DID_CHANGE_WATCHED_FILES)
@@ -196,6 +236,7 @@ async def did_change_watched_files(
     params: L.DidChangeWatchedFilesParams,
 ):
     await ls.ready
+    ls.flush_updates()
     for change in params.changes:
         match change.type:
             case L.FileChangeType.Changed:
@@ -209,6 +250,7 @@ async def did_change_watched_files(
 @server.feature(L.TEXT_DOCUMENT_DOCUMENT_SYMBOL)
 async def document_symbol(ls: JouleLanguageServer, params: L.DocumentSymbolParams):
     await ls.ready
+    ls.flush_updates()
     doc = ls.workspace.get_text_document(params.text_document.uri)
     return head_or_none(
         DocumentSymbolProvider().serve(tree) for tree in maybe(ls.store.get(doc.uri))
@@ -218,6 +260,7 @@ async def document_symbol(ls: JouleLanguageServer, params: L.DocumentSymbolParam
 @server.feature(L.TEXT_DOCUMENT_DEFINITION)
 async def definition(ls: JouleLanguageServer, params: L.DefinitionParams):
     await ls.ready
+    ls.flush_updates()
     doc = ls.workspace.get_text_document(params.text_document.uri)
     return head_or_none(
         DefinitionProvider(ls.store).serve(tree, params.position)
@@ -228,6 +271,7 @@ async def definition(ls: JouleLanguageServer, params: L.DefinitionParams):
 @server.feature(L.TEXT_DOCUMENT_REFERENCES)
 async def references(ls: JouleLanguageServer, params: L.ReferenceParams):
     await ls.ready
+    ls.flush_updates()
     doc = ls.workspace.get_text_document(params.text_document.uri)
     return head_or_none(
         ReferencesProvider(ls.store).serve(tree, params.position)
@@ -238,6 +282,7 @@ async def references(ls: JouleLanguageServer, params: L.ReferenceParams):
 @server.feature(L.TEXT_DOCUMENT_INLAY_HINT)
 async def inlay_hint(ls: JouleLanguageServer, params: L.InlayHintParams):
     await ls.ready
+    ls.flush_updates()
     doc = ls.workspace.get_text_document(params.text_document.uri)
     return head_or_none(
         InlayHintProvider().serve(tree) for tree in maybe(ls.store.get(doc.uri))
@@ -250,6 +295,7 @@ async def document_highlight(
     params: L.DocumentHighlightParams,
 ):
     await ls.ready
+    ls.flush_updates()
     doc = ls.workspace.get_text_document(params.text_document.uri)
     return head_or_none(
         DocumentHighlightProvider().serve(tree, params.position)
@@ -260,6 +306,7 @@ async def document_highlight(
 @server.feature(L.TEXT_DOCUMENT_RENAME)
 async def rename(ls: JouleLanguageServer, params: L.RenameParams):
     await ls.ready
+    ls.flush_updates()
     doc = ls.workspace.get_text_document(params.text_document.uri)
     return head_or_none(
         RenameProvider().serve(tree, params.position, params.new_name)
@@ -270,6 +317,7 @@ async def rename(ls: JouleLanguageServer, params: L.RenameParams):
 @server.feature(L.TEXT_DOCUMENT_PREPARE_RENAME)
 async def prepare_rename(ls: JouleLanguageServer, params: L.PrepareRenameParams):
     await ls.ready
+    ls.flush_updates()
     doc = ls.workspace.get_text_document(params.text_document.uri)
     return head_or_none(
         RenameProvider().prepare(tree, params.position)
@@ -280,6 +328,7 @@ async def prepare_rename(ls: JouleLanguageServer, params: L.PrepareRenameParams)
 @server.feature(L.TEXT_DOCUMENT_FOLDING_RANGE)
 async def folding_range(ls: JouleLanguageServer, params: L.FoldingRangeParams):
     await ls.ready
+    ls.flush_updates()
     doc = ls.workspace.get_text_document(params.text_document.uri)
     return head_or_none(
         FoldingRangeProvider().serve(tree) for tree in maybe(ls.store.get(doc.uri))
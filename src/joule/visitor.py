@@ -1,55 +1,68 @@
-from typing import Callable
+from functools import partial
+from typing import Any, Callable, ClassVar
 
 from joule import ast as A
 
+# Node types and the names of their `visit_*` methods, in the order they are matched.
+# Node types not matching any of them are not visited.
+VISIT_METHODS: list[tuple[type[A.AST], str]] = [
+    (A.Array, "visit_array"),
+    (A.AssertExpr, "visit_assert_expr"),
+    (A.Binary, "visit_binary"),
+    (A.Bool, "visit_bool"),
+    (A.Call, "visit_call"),
+    (A.Document, "visit_document"),
+    (A.Dollar, "visit_dollar"),
+    (A.FieldAccess, "visit_field_access"),
+    (A.Fn, "visit_fn"),
+    (A.Id.VarRef, "visit_var_ref"),
+    (A.If, "visit_if"),
+    (A.Import, "visit_import"),
+    (A.ListComp, "visit_list_comp"),
+    (A.Local, "visit_local"),
+    (A.Num, "visit_num"),
+    (A.ObjComp, "visit_obj_comp"),
+    (A.Object, "visit_object"),
+    (A.Self, "visit_self"),
+    (A.Slice, "visit_slice"),
+    (A.Str, "visit_str"),
+    (A.Super, "visit_super"),
+    (A.Unary, "visit_unary"),
+]
+
+
+def skip(visitor: "Visitor", tree: A.AST):
+    del visitor, tree
+
 
 class Visitor:
+    # `visit_*` methods of this visitor class by exact node type, filled in lazily by
+    # `visit`. Each subclass has its own table, so that overrides are respected.
+    dispatch: ClassVar[dict[type[A.AST], Callable[[Any, Any], None]]] = {}
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls.dispatch = {}
+
+    @classmethod
+    def visit_method_of(cls, node_type: type[A.AST]) -> Callable[[Any, Any], None]:
+        method = next(
+            (
+                getattr(cls, name)
+                for base, name in VISIT_METHODS
+                if issubclass(node_type, base)
+            ),
+            skip,
+        )
+        cls.dispatch[node_type] = method
+        return method
+
     def visit(self, tree: A.AST):
-        match tree:
-            case A.Array():
-                self.visit_array(tree)
-            case A.AssertExpr():
-                self.visit_assert_expr(tree)
-            case A.Binary():
-                self.visit_binary(tree)
-            case A.Bool():
-                self.visit_bool(tree)
-            case A.Call():
-                self.visit_call(tree)
-            case A.Document():
-                self.visit_document(tree)
-            case A.Dollar():
-                self.visit_dollar(tree)
-            case A.FieldAccess():
-                self.visit_field_access(tree)
-            case A.Fn():
-                self.visit_fn(tree)
-            case A.Id.VarRef():
-                self.visit_var_ref(tree)
-            case A.If():
-                self.visit_if(tree)
-            case A.Import():
-                self.visit_import(tree)
-            case A.ListComp():
-                self.visit_list_comp(tree)
-            case A.Local():
-                self.visit_local(tree)
-            case A.Num():
-                self.visit_num(tree)
-            case A.ObjComp():
-                self.visit_obj_comp(tree)
-            case A.Object():
-                self.visit_object(tree)
-            case A.Self():
-                self.visit_self(tree)
-            case A.Slice():
-                self.visit_slice(tree)
-            case A.Str():
-                self.visit_str(tree)
-            case A.Super():
-                self.visit_super(tree)
-            case A.Unary():
-                self.visit_unary(tree)
+        # `Bind` and `FixedKey` nodes never reach here: they are always dispatched
+        # directly by their parent nodes via `visit_bind` and `visit_fixed_key`.
+        node_type = type(tree)
+        method = self.dispatch.get(node_type) or self.visit_method_of(node_type)
+        method(self, tree)
 
     def visit_arg(self, a: A.Arg):
         if a.id is not None:
@@ -85,13 +98,18 @@ class Visitor:
             self.visit_arg(a)
 
     def visit_comp_spec(self, s: A.CompSpec, next: Callable[[], None]):
-        match s:
-            case []:
+        # Each spec is visited with the rest of the specs as its continuation, so that
+        # variables bound by for-specs are in scope for them. Indexes into `s` instead
+        # of slicing off the rest of the specs at every step.
+        def visit_from(i: int):
+            if i == len(s):
                 next()
-            case A.ForSpec() as first, *rest:
-                self.visit_for_spec(first, lambda: self.visit_comp_spec(rest, next))
-            case A.IfSpec() as first, *rest:
-                self.visit_if_spec(first, lambda: self.visit_comp_spec(rest, next))
+            elif isinstance(spec := s[i], A.ForSpec):
+                self.visit_for_spec(spec, partial(visit_from, i + 1))
+            else:
+                self.visit_if_spec(spec, partial(visit_from, i + 1))
+
+        visit_from(0)
 
     def visit_computed_key(self, f: A.Field, k: A.ComputedKey):
         del f
@@ -138,7 +156,7 @@ class Visitor:
 
     def visit_list_comp(self, e: A.ListComp):
         self.visit_comp_spec(
-            [e.for_spec] + e.comp_spec,
+            e.specs,
             lambda: self.visit(e.expr),
         )
 
@@ -159,7 +177,7 @@ class Visitor:
                 self.visit_assert(a)
             self.visit(e.field.value)
 
-        self.visit_comp_spec([e.for_spec] + e.comp_spec, next)
+        self.visit_comp_spec(e.specs, next)
 
     def visit_object(self, e: A.Object):
         # The following traversal order is important:
@@ -1,4 +1,4 @@
-from itertools import accumulate, chain
+from functools import cached_property
 
 import lsprotocol.types as L
 from rich.text import Text
@@ -18,18 +18,15 @@ class FakeDocument:
         self.cst = parse_jsonnet(self.source)
         self.ast = ScopeResolver().resolve(A.Document.from_cst(self.uri, self.cst))
         self.body = self.ast.body
-        self.lines = self.source.splitlines(keepends=True)
-
-        # When the source ends with a newline, `str.splitlines` does not preserve the
-        # last empty line.
-        if source.endswith("\n"):
-            self.lines.append("")
 
         # Computes the character offset of the first character in each line, used for
-        # converting 2D positions to 1D offsets.
-        self.line_offsets: list[int] = list(
-            accumulate(chain([0], map(len, self.lines)))
-        )
+        # converting 2D positions to 1D offsets, followed by the length of the source.
+        self.line_offsets: list[int] = [0]
+        i = self.source.find("\n")
+        while i != -1:
+            self.line_offsets.append(i + 1)
+            i = self.source.find("\n", i + 1)
+        self.line_offsets.append(len(self.source))
 
     @property
     def location(self) -> L.Location:
@@ -49,6 +46,12 @@ class FakeDocument:
     def end_of(self, mark: int) -> L.Position:
         return self.at(mark).range.end
 
+    @cached_property
+    def size(self) -> tuple[int, int]:
+        """The max line width and the number of lines of the source, for rendering."""
+        raw_lines = self.source.splitlines()
+        return max(map(len, raw_lines)), len(raw_lines)
+
     def highlight(
         self, ranges: tuple[L.Range, str] | list[tuple[L.Range, str]]
     ) -> Text:
@@ -92,9 +95,7 @@ class FakeDocument:
                 end=offset_of(span.end),
             )
 
-        raw_lines = self.source.splitlines()
-        width = max(map(len, raw_lines))
-        height = len(raw_lines)
+        width, height = self.size
 
         # The width of the line number gutter equals to the max width of the line
         # numbers plus one (for a padding space).
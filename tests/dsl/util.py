@@ -15,13 +15,14 @@ def side_by_side(lhs: Text | str, rhs: Text | str) -> Text:
     shorter = lhs_lines if len(lhs_lines) < len(rhs_lines) else rhs_lines
     shorter.extend([empty] * abs(len(lhs_lines) - len(rhs_lines)))
 
-    max_width = max(map(len, lhs.plain.splitlines()))
+    max_width = max(map(len, lhs_lines), default=0)
     sep = Text.styled(" : ", "grey50")
 
+    # The base style of each `lhs_line` only covers the line itself, not the padding
+    # or the separator.
     return Text("\n").join(
         [
-            lhs_line + padding + sep + rhs_line
+            Text.assemble(lhs_line, " " * (max_width - len(lhs_line)), sep, rhs_line)
             for lhs_line, rhs_line in zip(lhs_lines, rhs_lines)
-            if (padding := " " * (max_width - len(lhs_line))) is not None
         ]
     )
@@ -1035,3 +1035,19 @@ class TestAST(unittest.TestCase):
                 ),
             ),
         )
+
+    def test_node_at_many_children(self):
+        t = FakeDocument(
+            dedent(
+                """\
+                [1, 2, 3, 4, 5, 6, 7, 8, [9], 10]
+                                          ^1  ^^2
+                                         ^^^3
+                """
+            )
+        )
+
+        self.assertEqual(t.node_at(1), A.Num(t.at(1), 9))
+        self.assertEqual(t.node_at(2), A.Num(t.at(2), 10))
+        self.assertIsInstance(t.node_at(3), A.Array)
+        self.assertIsInstance(t.node_at(t.end_of(2)), A.Num)
@@ -481,6 +481,22 @@ class TestFieldDefinition(DefinitionTestCase):
             refs=[t.node_at(1)],
         )
 
+    def test_cyclic_callee(self):
+        t = self.fake_document(
+            dedent(
+                """\
+                local f = f; f(1).x
+                                  ^1
+                """
+            )
+        )
+
+        self.assertFieldDefined(
+            self.fake_workspace(t),
+            fields=[],
+            refs=[t.node_at(1)],
+        )
+
 
 class TestParamFieldDefinition(DefinitionTestCase):
     def test_literal_arg(self):
@@ -638,3 +654,85 @@ class TestParamFieldDefinition(DefinitionTestCase):
             fields=[],
             refs=[t.node_at(1)],
         )
+
+
+class TestDefinitionCache(DefinitionTestCase):
+    def test_invalidated_on_update(self):
+        lib = self.fake_document("{ f: 1 }", "lib.jsonnet")
+        t = self.fake_document(
+            dedent(
+                """\
+                (import "lib.jsonnet").f
+                                       ^1
+                """
+            ),
+        )
+
+        store = self.fake_workspace(docs=[lib, t])
+        tree = must(store.get(t.uri))
+        def_provider = DefinitionProvider(store)
+
+        first = def_provider.serve(tree, t.start_of(1))
+        second = def_provider.serve(tree, t.start_of(1))
+        self.assertSequenceEqual(first, second)
+        self.assertIsNot(first, second)
+
+        self.write_file("{ g: 1, f: 2 }", lib.uri)
+        store.update(lib.uri)
+
+        self.assertSequenceEqual(
+            [
+                location.range.start.character
+                for location in def_provider.serve(tree, t.start_of(1))
+            ],
+            [8],
+        )
+
+    def test_partial_callers_not_memoized(self):
+        t = self.fake_document(
+            dedent(
+                """\
+                local f(p) = p.a() + p.b();
+                               ^1      ^2
+                f({ a(): 1, b(): 2 })
+                    ^3      ^4
+                """
+            ),
+        )
+
+        store = self.fake_workspace(t)
+        tree = must(store.get(t.uri))
+
+        # Resolving `p.a` searches for callers of `f`, during which `p.b` is resolved
+        # against the incomplete callers of `f`.
+        self.assertSequenceEqual(
+            DefinitionProvider(store).serve(tree, t.start_of(1)), [t.at(3)]
+        )
+        self.assertSequenceEqual(
+            DefinitionProvider(store).serve(tree, t.start_of(2)), [t.at(4)]
+        )
+
+        store.clear_caches()
+        self.assertSequenceEqual(
+            DefinitionProvider(store).serve_many(tree, [t.start_of(1), t.start_of(2)]),
+            [[t.at(3)], [t.at(4)]],
+        )
+
+    def test_serve_many(self):
+        t = self.fake_document(
+            dedent(
+                """\
+                local v = 1, w = 2; v + w + 3
+                      ^1     ^2     ^3  ^4  ^5
+                """
+            ),
+        )
+
+        store = self.fake_workspace(t)
+        tree = must(store.get(t.uri))
+        positions = [t.start_of(mark) for mark in [5, 3, 4, 1]]
+
+        self.assertSequenceEqual(
+            DefinitionProvider(store).serve_many(tree, positions),
+            [[], [t.at(1)], [t.at(2)], []],
+        )
@@ -228,3 +228,15 @@ class TestDocumentStoreLoadWorkspace(DocumentStoreTestCase):
                 "f5.jsonnet",
             ],
         )
+
+    def test_update(self):
+        store = self.fake_workspace({"f1.jsonnet": "1"})
+        uri = self.to_uri("f1.jsonnet")
+        tree = store.get(uri)
+
+        store.update(uri)
+        self.assertIs(store.get(uri), tree)
+
+        self.write_file("2", uri)
+        store.update(uri)
+        self.assertIsNot(store.get(uri), tree)
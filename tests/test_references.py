@@ -1,6 +1,9 @@
 from textwrap import dedent
 
+import lsprotocol.types as L
+
 from joule.ast import AST, Id
+from joule.maybe import must
 from joule.model import DocumentStore
 from joule.providers import ReferencesProvider
 
@@ -135,3 +138,60 @@ class TestFieldReferences(ReferencesTestCase):
             field=t.node_at(1),
             refs=[t.node_at(2)],
         )
+
+    def test_cyclic_import(self):
+        t1 = self.fake_document(
+            dedent(
+                """\
+                { f: 1, g: self.f, h: import "doc2.jsonnet" }
+                  ^1           ^2
+                """
+            ),
+            "doc1.jsonnet",
+        )
+
+        t2 = self.fake_document(
+            dedent(
+                """\
+                (import "doc1.jsonnet").f
+                                        ^1
+                """
+            ),
+            "doc2.jsonnet",
+        )
+
+        self.assertFieldReferenced(
+            self.fake_workspace([t1, t2]),
+            field=t1.node_at(1),
+            refs=[t1.node_at(2), t2.node_at(1)],
+        )
+
+    def test_fields_of_param(self):
+        t = self.fake_document(
+            dedent(
+                """\
+                local f(p) = p.a() + p.b();
+                               ^1      ^2
+                f({ a(): 1, b(): 2 })
+                    ^3      ^4
+                """
+            )
+        )
+
+        # Resolving `p.a` searches for callers of `f`, during which `p.b` is resolved
+        # against the incomplete callers of `f`.
+        store = self.fake_workspace(t)
+        self.assertFieldReferenced(store, field=t.node_at(3), refs=[t.node_at(1)])
+        self.assertFieldReferenced(store, field=t.node_at(4), refs=[t.node_at(2)])
+
+    def test_invalidated_on_update(self):
+        t1 = self.fake_document("{ f: 1 }", "doc1.jsonnet")
+        t2 = self.fake_document('(import "doc1.jsonnet").f', "doc2.jsonnet")
+
+        store = self.fake_workspace([t1, t2])
+        field = must(must(store.get(t1.uri)).node_at(L.Position(0, 2)))
+        self.assertEqual(len(list(ReferencesProvider(store).find_references(field))), 1)
+
+        self.write_file('(import "doc1.jsonnet").g', t2.uri)
+        store.update(t2.uri)
+        self.assertEqual(len(list(ReferencesProvider(store).find_references(field))), 0)
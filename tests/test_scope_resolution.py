@@ -166,3 +166,40 @@ class TestScopeResolution(unittest.TestCase):
             var=t.node_at(2).to(A.Id.Var),
             target=param(A.Id.Var(t.at(2), "p")),
         )
+
+    def test_objects_without_fixed_keys_share_empty_field_scope(self):
+        t = FakeDocument(
+            """\
+            [{}, { ['f']: 1 }, { f: 1 }]
+             ^^1 ^^^^^^^^^^^^2 ^^^^^^^^3
+            """
+        )
+
+        self.assertIs(t.node_at(1).to(A.Object).field_scope, A.FieldScope.EMPTY)
+        self.assertIs(t.node_at(2).to(A.Object).field_scope, A.FieldScope.EMPTY)
+        self.assertIsNot(t.node_at(3).to(A.Object).field_scope, A.FieldScope.EMPTY)
+
+    def test_self_and_dollar_objects(self):
+        t = FakeDocument(
+            """\
+            { f: { g: [self, $] } }
+            ^^^^^^^^^^^^^^^^^^^^^^^1
+                 ^^^^^^^^^^^^^^^^2
+                       ^^^^3
+                             ^4
+            """
+        )
+
+        self.assertIs(t.node_at(3).to(A.Self).enclosing_object, t.node_at(2))
+        self.assertIs(t.node_at(4).to(A.Dollar).outermost_object, t.node_at(1))
+
+    def test_for_spec_var_refs(self):
+        t = FakeDocument(
+            """\
+            local x = 1; [x + i for i in [1, 2]]
+                          ^1  ^2
+            """
+        )
+
+        self.assertFalse(t.node_at(1).to(A.Id.VarRef).is_for_spec_ref)
+        self.assertTrue(t.node_at(2).to(A.Id.VarRef).is_for_spec_ref)
@@ -0,0 +1,54 @@
+import asyncio
+
+from joule.maybe import must
+from joule.model import DocumentStore
+from joule.providers import DocumentSymbolProvider
+from joule.server import UPDATE_DELAY, JouleLanguageServer
+
+from . import TempWorkspaceTestCase
+
+
+class TestDebouncedUpdates(TempWorkspaceTestCase):
+    def fake_server(self, store: DocumentStore) -> JouleLanguageServer:
+        ls = JouleLanguageServer("joule-test", "v0")
+        ls.state = JouleLanguageServer.State.Initialized
+        ls._document_store = store
+        return ls
+
+    def symbol_names(self, ls: JouleLanguageServer, uri: str) -> list[str]:
+        tree = must(ls.store.get(uri))
+        return [symbol.name for symbol in DocumentSymbolProvider().serve(tree)]
+
+    def test_flushed_before_request(self):
+        t = self.fake_document("{ a: 1 }")
+        ls = self.fake_server(self.fake_workspace(t))
+
+        async def edit():
+            for source in ["{ b: 1 }", "{ c: 1 }", "{ d: 1 }"]:
+                self.write_file(source, t.uri)
+                ls.schedule_update(t.uri)
+
+            # Rapid changes are coalesced into a single pending update.
+            self.assertEqual(list(ls.pending_updates), [t.uri])
+            self.assertEqual(self.symbol_names(ls, t.uri), ["a"])
+
+            # Every request handler flushes pending updates first.
+            ls.flush_updates()
+            self.assertEqual(ls.pending_updates, {})
+            self.assertEqual(self.symbol_names(ls, t.uri), ["d"])
+
+        asyncio.run(edit())
+
+    def test_applied_after_delay(self):
+        t = self.fake_document("{ a: 1 }")
+        ls = self.fake_server(self.fake_workspace(t))
+
+        async def edit():
+            self.write_file("{ b: 1 }", t.uri)
+            ls.schedule_update(t.uri)
+
+            await asyncio.sleep(UPDATE_DELAY * 2)
+            self.assertEqual(ls.pending_updates, {})
+            self.assertEqual(self.symbol_names(ls, t.uri), ["b"])
+
+        asyncio.run(edit())